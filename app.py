@@ -17,53 +17,14 @@ st.set_page_config(
 )
 
 # -----------------------------------------------------------
-# CSS  (light mode, single separators, compact KPI chips)
+# CSS  (assets/style.css — light mode, single separators, compact KPI chips)
 # -----------------------------------------------------------
-st.markdown("""
-<style>
-:root{
-  --border:#dbe4f3; --text:#0f172a; --muted:#475569; --soft:#f8fafc;
-  --pill-bg:#eef2ff; --pill-text:#3730a3; --badge:#e2e8f0; --accent:#0ea5e9;
-  --sep:#e5edf7;
-  --kpi-a:#14b8a6; /* teal: activity */
-  --kpi-b:#7c3aed; /* violet: cohort/typology */
-  --kpi-c:#1d4ed8; /* blue: volumes/tx */
-  --kpi-d:#10b981; /* green: lending/bridge */
-}
-html,body,[class^="css"],.stApp{color:var(--text);}
-
-h1,h2,h3{margin:0 0 .3rem 0; font-weight:800;}
-.section-title{font-size:1.35rem; font-weight:800; margin:.25rem 0 .5rem 0;}
-.section-def{background:#f6f8ff; border:1px solid var(--border); padding:.8rem 1rem; border-radius:.75rem; margin:.25rem 0 1rem 0; color:var(--muted);}
-.def-pill{display:inline-block; font-weight:700; color:var(--pill-text); background:var(--pill-bg); border-radius:999px; padding:.15rem .6rem; margin-right:.6rem; border:1px solid #c7d2fe;}
-
-.sep{height:1px; background:var(--sep); margin:1.25rem 0 .85rem 0;}
-
-.card{background:#fff; border:1px solid var(--border); border-radius:.9rem; padding:1rem;}
-.card.tight{padding:.6rem .85rem;}
-
-.hero{background:#fff; border:1px solid var(--border); border-radius:1rem; padding:1rem 1.2rem;}
-.hero .context{background:#f7f9ff; border:1px solid var(--border); padding:.9rem 1rem; border-radius:.75rem; color:var(--muted);}
-
-/* KPI compact chip */
-.kpi{display:flex; align-items:center; gap:.6rem;
-     border:1px solid var(--border); border-radius:.75rem;
-     padding:.55rem .8rem; font-size:1.05rem; background:#fff;}
-.kpi .stripe{width:.4rem; height:1.35rem; border-radius:.25rem;}
-.kpi .v{font-weight:800;}
-
-/* color map */
-.kpi.a .stripe{background:var(--kpi-a);}  /* teal */
-.kpi.b .stripe{background:var(--kpi-b);}  /* violet */
-.kpi.c .stripe{background:var(--kpi-c);}  /* blue */
-.kpi.d .stripe{background:var(--kpi-d);}  /* green */
-
-/* Insight pill */
-.insight{background:#f6faff; border:1px solid var(--border);
-         padding:.8rem 1rem; border-radius:.75rem; margin:.6rem 0 0 0;}
-.insight strong{margin-right:.35rem;}
-</style>
-""", unsafe_allow_html=True)
+@st.cache_resource
+def load_css(name: str = "style.css") -> str:
+    """Read the stylesheet once per process; reruns reuse the cached string."""
+    return (Path(__file__).parent / "assets" / name).read_text(encoding="utf-8")
+
+st.markdown(f"<style>\n{load_css()}</style>", unsafe_allow_html=True)
 
 # -----------------------------------------------------------
 # Helpers
@@ -71,23 +32,81 @@ h1,h2,h3{margin:0 0 .3rem 0; font-weight:800;}
 DATA_DIR = Path("data")
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 
-def read_csv(name: str, parse_month=True):
+def downcast_numeric(df: pd.DataFrame) -> pd.DataFrame:
+    """Monthly aggregates don't need 64-bit precision: float64 -> float32, int64 -> smallest int."""
+    for c in df.select_dtypes("float64").columns:
+        df[c] = df[c].astype("float32")
+    for c in df.select_dtypes("int64").columns:
+        df[c] = pd.to_numeric(df[c], downcast="integer")
+    return df
+
+def month_label(s: pd.Series) -> pd.Series:
+    """'YYYY-MM' strings for Plotly x values: still a date axis, but no per-point datetime serialization."""
+    return s.dt.strftime("%Y-%m")
+
+def ordered_category(s: pd.Series, order: list[str]) -> pd.Series:
+    """Ordered categorical in display order; values not listed in `order` are kept, sorted, at the end.
+    Every `order` entry stays in the dtype even when absent (so remaps onto a listed value work);
+    plots group with observed=True, which skips the empty ones."""
+    present = set(s.dropna().unique())
+    cats = list(order) + sorted(present.difference(order))
+    return s.astype(pd.CategoricalDtype(cats, ordered=True))
+
+def _mtime(path) -> float:
+    # one stat() per file per rerun (no separate exists() probe); 0.0 marks a missing file
+    try:
+        return os.stat(path).st_mtime
+    except OSError:
+        return 0.0
+
+def read_csv(name: str, parse_month=True, categories: dict[str, list[str]] | None = None):
     fp = DATA_DIR / name
-    if not fp.exists():
+    mtime = _mtime(fp)
+    # typed columnar copy from scripts/to_parquet.py, used unless the CSV was refreshed after it
+    pq = fp.with_suffix(".parquet")
+    pq_mtime = _mtime(pq)
+    if pq_mtime and pq_mtime >= mtime:
+        fp, mtime = pq, pq_mtime
+    if not mtime:
         st.info(f"Missing data file: {name}")
         return pd.DataFrame()
-    df = pd.read_csv(fp)
-    if parse_month and "MONTH" in df.columns:
-        df["MONTH"] = pd.to_datetime(df["MONTH"])
-    return df
+    return _load_csv(fp, mtime, parse_month, categories)
+
+@st.cache_data(show_spinner=False)
+def _load_csv(fp: Path, mtime: float, parse_month: bool, categories: dict[str, list[str]] | None) -> pd.DataFrame:
+    """Parsed once per file version (`mtime` only keys the cache); reruns get a cached copy."""
+    if fp.suffix == ".parquet":
+        df = pd.read_parquet(fp, engine="pyarrow")
+    else:
+        # multithreaded Arrow parser (pyarrow ships with streamlit); numpy dtypes are kept for the code below
+        df = pd.read_csv(fp, engine="pyarrow")
+    # Arrow/Parquet usually hand MONTH back as datetimes already; text months (YYYY-MM or
+    # full ISO timestamps) get a pinned ISO8601 parse instead of per-string format inference
+    if parse_month and "MONTH" in df.columns and not pd.api.types.is_datetime64_any_dtype(df["MONTH"]):
+        df["MONTH"] = pd.to_datetime(df["MONTH"], format="ISO8601")
+    # chronological order is assumed downstream (first/last-row KPIs)
+    if "MONTH" in df.columns:
+        df = df.sort_values("MONTH", kind="stable", ignore_index=True)
+    for col, order in (categories or {}).items():
+        if col in df.columns:
+            df[col] = ordered_category(df[col], order)
+    # any other low-cardinality label column (e.g. FEE_CATEGORY) -> plain category
+    for col in df.select_dtypes(["object", "string"]).columns:
+        if df[col].nunique() < 50:
+            df[col] = df[col].astype("category")
+    return downcast_numeric(df)
 
 def draw_section(title: str, definition: str):
     st.markdown('<div class="sep"></div>', unsafe_allow_html=True)
     st.markdown(f'<div class="section-title">{title}</div>', unsafe_allow_html=True)
     st.markdown(f'<div class="section-def"><span class="def-pill">Definition</span>{definition}</div>', unsafe_allow_html=True)
 
-def kpi_inline(container, html: str, style: str = "c"):
-    container.markdown(f'<div class="kpi {style}"><div class="stripe"></div><div>{html}</div></div>', unsafe_allow_html=True)
+def kpi_chip(html: str, style: str = "c") -> str:
+    return f'<div class="kpi {style}"><div class="stripe"></div><div>{html}</div></div>'
+
+def kpi_row(chips: list[tuple[str, str]]):
+    """Emit a row of (html, style) KPI chips as a single markdown element."""
+    st.markdown(f'<div class="kpi-row">{"".join(kpi_chip(h, s) for h, s in chips)}</div>', unsafe_allow_html=True)
 
 def insight(text: str):
     st.markdown(f'<div class="insight"><strong>Insight.</strong>{text}</div>', unsafe_allow_html=True)
@@ -100,6 +119,35 @@ KPI_STYLE = {
     "green": "d",  # lending/bridge
 }
 
+# Fixed display order for low-cardinality keys (cast to ordered categoricals at load)
+CATEGORY_ORDER = [
+    "Bridge Activity", "DEX Trading", "Lending Borrows", "Lending Deposits",
+    "Liquidations", "NFT Sales", "Token Transfers",
+]
+SECTOR_ORDER = [
+    "DEX Trading", "Lending Deposits", "Lending Borrows", "NFT Sales",
+    "NFT Transfers", "Others",
+]
+RATES_DIR_ORDER = ["Up", "Hold", "Down"]
+
+# Series colors (section 1 categories / section 2 sectors), built once at import
+CATEGORY_COLORS = {
+    "Bridge Activity":"#14b8a6",
+    "DEX Trading":"#1d4ed8",
+    "Lending Deposits":"#10b981",
+    "Lending Borrows":"#7c3aed",
+    "Liquidations":"#f59e0b",
+    "NFT Sales":"#fb7185",
+    "Token Transfers":"#64748b"
+}
+SECTOR_COLORS = {
+    "DEX Trading": "#1d4ed8",       # blue
+    "Lending Deposits": "#10b981",  # green
+    "Lending Borrows": "#7c3aed",   # violet
+    "NFT Sales": "#f59e0b",         # amber
+    "Others": "#64748b",            # slate  (now includes NFT Transfers)
+}
+
 # -----------------------------------------------------------
 # Title + Executive Summary (whole text inside "context" box)
 # -----------------------------------------------------------
@@ -137,30 +185,31 @@ This view sets the stage for the panel discussion: the sustainability of the mov
 # -----------------------------------------------------------
 # Load data
 # -----------------------------------------------------------
-df_volcat   = read_csv("volume_category.csv")      # MONTH, CATEGORY, VOLUME_USD, VOLUME_USD_BILLIONS
+# Load only what the sections below render; the cohort / typology / DEX / bridge / lending
+# exports stay in data/ but are not charted, so they are not parsed on every rerun.
+df_volcat   = read_csv("volume_category.csv", categories={"CATEGORY": CATEGORY_ORDER})  # MONTH, CATEGORY, VOLUME_USD, VOLUME_USD_BILLIONS
 #df_active   = read_csv("active_addresses.csv")     # MONTH, CATEGORY, ACTIVE_ADDRESSES, TRANSACTIONS
-df_cohort   = read_csv("user_cohort.csv")          # MONTH, COHORT, UNIQUE_USERS, TOTAL_VOLUME, AVG_VOLUME_PER_USER
-df_typology = read_csv("user_typology.csv")        # MONTH, USER_TYPE, ACTIVITY_LEVEL, UNIQUE_USERS, AVG_VOLUME_PER_USER, AVG_TRANSACTIONS_PER_USER
-df_dex      = read_csv("dex_volume.csv")           # MONTH, ACTIVE_SWAPPERS, TOTAL_VOLUME_USD, TOTAL_VOLUME_BILLIONS, AVG_SWAP_SIZE, TOTAL_SWAPS
-df_bridge   = read_csv("bridged_volume.csv")       # MONTH, INFLOW_BILLIONS, OUTFLOW_BILLIONS, NET_FLOW_BILLIONS, UNKNOWN_FLOW_BILLIONS, TOTAL_BRIDGE_VOLUME_BILLIONS
+#df_cohort   = read_csv("user_cohort.csv")          # MONTH, COHORT, UNIQUE_USERS, TOTAL_VOLUME, AVG_VOLUME_PER_USER
+#df_typology = read_csv("user_typology.csv")        # MONTH, USER_TYPE, ACTIVITY_LEVEL, UNIQUE_USERS, AVG_VOLUME_PER_USER, AVG_TRANSACTIONS_PER_USER
+#df_dex      = read_csv("dex_volume.csv")           # MONTH, ACTIVE_SWAPPERS, TOTAL_VOLUME_USD, TOTAL_VOLUME_BILLIONS, AVG_SWAP_SIZE, TOTAL_SWAPS
+#df_bridge   = read_csv("bridged_volume.csv")       # MONTH, INFLOW_BILLIONS, OUTFLOW_BILLIONS, NET_FLOW_BILLIONS, UNKNOWN_FLOW_BILLIONS, TOTAL_BRIDGE_VOLUME_BILLIONS
 df_eth      = read_csv("eth_price.csv")            # MONTH, AVG_ETH_PRICE_USD, TOTAL_TRANSACTIONS, UNIQUE_USERS, TOTAL_VOLUME_BILLIONS, ACTIVITY_INDEX_ZSCORE
-df_lend     = read_csv("lending_deposits.csv")     # MONTH, PLATFORM, UNIQUE_DEPOSITORS, TOTAL_DEPOSIT_VOLUME, VOLUME_BILLIONS, AVG_DEPOSIT_SIZE, MONTHLY_TOTAL_BILLIONS, PLATFORM_MARKET_SHARE
+#df_lend     = read_csv("lending_deposits.csv")     # MONTH, PLATFORM, UNIQUE_DEPOSITORS, TOTAL_DEPOSIT_VOLUME, VOLUME_BILLIONS, AVG_DEPOSIT_SIZE, MONTHLY_TOTAL_BILLIONS, PLATFORM_MARKET_SHARE
 df_fees     = read_csv("fees_activity.csv")        # MONTH, AVG_FEE_USD, FEE_CATEGORY, TOTAL_TRANSACTIONS, UNIQUE_USERS, TRANSACTIONS_MILLIONS, USERS_MILLIONS, ...
-def load_active_activity(path="data/active_addresses.csv"):
+@st.cache_data(show_spinner=False)
+def load_active_activity(path="data/active_addresses.csv", mtime: float = 0.0):
     """
     Reads MONTH;SECTOR;AVG_DAILY_ACTIVE_ADDRESSES;TRANSACTIONS
-    Accepts ';' or ',' (auto-detect). Parses MONTH (YYYY-MM), trims SECTOR, and
-    coerces numeric columns.
+    Accepts ';' or ',' (detected from the header). Parses MONTH (YYYY-MM), trims
+    SECTOR, and coerces numeric columns.
+    Cached per (path, mtime): the sniff + parse run once per file version.
     """
     with open(path, "r", encoding="utf-8") as f:
         head = f.read(4096)
-    default_sep = ";" if head.count(";") > head.count(",") else ","
+    sep = ";" if head.count(";") > head.count(",") else ","
 
-    df = pd.read_csv(
-        path,
-        sep=default_sep if default_sep in [";", ","] else None,
-        engine="python"
-    )
+    # Separator is known here, so hand it to the multithreaded Arrow parser (no python-engine sniffing)
+    df = pd.read_csv(path, sep=sep, engine="pyarrow")
 
     # Normalize columns
     df.columns = [c.strip() for c in df.columns]
@@ -179,17 +228,99 @@ def load_active_activity(path="data/active_addresses.csv"):
         return pd.DataFrame(columns=list(expected))
 
     df["MONTH"] = pd.to_datetime(df["MONTH"], format="%Y-%m", errors="coerce")
-    df["SECTOR"] = df["SECTOR"].astype(str).str.strip()
+    df["SECTOR"] = ordered_category(df["SECTOR"].astype(str).str.strip(), SECTOR_ORDER)
 
+    # Arrow already types clean integer columns natively; only coerce what came back as text
     for c in ["AVG_DAILY_ACTIVE_ADDRESSES", "TRANSACTIONS"]:
-        df[c] = pd.to_numeric(df[c], errors="coerce")
+        if not pd.api.types.is_numeric_dtype(df[c]):
+            df[c] = pd.to_numeric(df[c], errors="coerce")
+    df = downcast_numeric(df)
 
     df = df.dropna(subset=["MONTH", "SECTOR"])
     df = df.sort_values(["MONTH", "SECTOR"], kind="stable").reset_index(drop=True)
     return df
 
 # Call the loader
-df_active = load_active_activity("data/active_addresses.csv")
+active_mtime = _mtime("data/active_addresses.csv")
+df_active = load_active_activity("data/active_addresses.csv", active_mtime)
+
+# -----------------------------------------------------------
+# Widget-independent aggregates & KPIs (sections 1, 2, 3, 5)
+# -----------------------------------------------------------
+@st.cache_data(show_spinner=False)
+def precompute_kpis(df_volcat: pd.DataFrame, df_active: pd.DataFrame,
+                    df_fees: pd.DataFrame, df_eth: pd.DataFrame) -> dict:
+    """
+    Everything the sections derive from the loaded frames that does not depend on a widget,
+    computed once per version of the data. Only the section 2 metric pick is resolved at render
+    time (a dict lookup into the per-metric KPIs below).
+    """
+    out = {}
+
+    if not df_volcat.empty:
+        latest_month = df_volcat["MONTH"].max()
+        out["volcat_peak"] = df_volcat.groupby("MONTH")["VOLUME_USD_BILLIONS"].sum().max()
+        # quick dominance proxy: DEX share latest (plain boolean masks + NumPy sums)
+        vols = df_volcat["VOLUME_USD_BILLIONS"].to_numpy()
+        is_latest = (df_volcat["MONTH"] == latest_month).to_numpy()
+        is_dex = (df_volcat["CATEGORY"] == "DEX Trading").to_numpy()
+        total = vols[is_latest].sum()
+        out["volcat_dex_share"] = 100 * vols[is_latest & is_dex].sum() / total if total else np.nan
+        out["volcat_plot"] = df_volcat[["MONTH","CATEGORY","VOLUME_USD_BILLIONS"]].assign(
+            MONTH=month_label(df_volcat["MONTH"]))
+
+    if {"MONTH","SECTOR","AVG_DAILY_ACTIVE_ADDRESSES","TRANSACTIONS"}.issubset(df_active.columns) and not df_active.empty:
+        # ❗ Merge NFT Transfers into Others (token transfers)
+        # group on the remapped key directly, so df_active is neither copied nor mutated
+        sector = df_active["SECTOR"].where(df_active["SECTOR"] != "NFT Transfers", "Others")
+        # aggregate in case both 'Others' and 'NFT Transfers' existed for a month
+        # (groupby already returns the keys sorted by MONTH, then SECTOR order: no extra sort)
+        data = (
+            df_active.groupby(["MONTH", sector], as_index=False, observed=True)
+                .agg({
+                    "AVG_DAILY_ACTIVE_ADDRESSES": "sum",
+                    "TRANSACTIONS": "sum"
+                })
+        )
+        d_last = data[data["MONTH"] == data["MONTH"].max()]
+        peak, dex_share = {}, {}
+        for y_col in ("AVG_DAILY_ACTIVE_ADDRESSES", "TRANSACTIONS"):
+            peak[y_col] = data.groupby("MONTH")[y_col].sum().max()
+            dex_share[y_col] = np.nan
+            if not d_last.empty and d_last[y_col].sum() > 0:
+                dex_share[y_col] = 100 * d_last.loc[d_last["SECTOR"]=="DEX Trading", y_col].sum() / d_last[y_col].sum()
+        data["MONTH"] = month_label(data["MONTH"])  # only plotted from here on
+        out.update(active_data=data, active_peak=peak, active_dex_share=dex_share)
+
+    if not df_fees.empty:
+        # collapse to monthly totals (if multiple FEE_CATEGORY rows); groupby output is MONTH-sorted
+        agg = df_fees.groupby("MONTH", as_index=False).agg({
+            "USERS_MILLIONS":"sum",
+            "AVG_FEE_USD":"mean"
+        })
+        # agg is sorted by MONTH: first/last months are the array ends; both growths in one vector op
+        first, last = agg[["USERS_MILLIONS", "AVG_FEE_USD"]].to_numpy(dtype="float64")[[0, -1]]
+        out["fees_agg"] = agg
+        out["fees_user_growth"], out["fees_change"] = 100 * (last - first) / np.maximum(first, 1e-9)
+        agg["MONTH"] = month_label(agg["MONTH"])  # only plotted from here on
+
+    if not df_eth.empty:
+        out["eth_price_min"] = df_eth["AVG_ETH_PRICE_USD"].min()
+        out["eth_price_max"] = df_eth["AVG_ETH_PRICE_USD"].max()
+        # Pearson directly on the loader's float arrays (no casts, no 2x2 matrix for one scalar)
+        corr = np.nan
+        if len(df_eth) > 1:
+            xm = df_eth["AVG_ETH_PRICE_USD"].to_numpy()
+            ym = df_eth["ACTIVITY_INDEX_ZSCORE"].to_numpy()
+            xm, ym = xm - xm.mean(), ym - ym.mean()
+            corr = float((xm * ym).sum() / np.sqrt((xm * xm).sum() * (ym * ym).sum()))
+        out["eth_corr"] = corr
+        out["eth_plot"] = df_eth[["MONTH","AVG_ETH_PRICE_USD","ACTIVITY_INDEX_ZSCORE"]].assign(
+            MONTH=month_label(df_eth["MONTH"]))
+
+    return out
+
+kpis = precompute_kpis(df_volcat, df_active, df_fees, df_eth)
 # -----------------------------------------------------------
 # 1) Monthly On-Chain USD Volume by Category  (Stacked Area)
 # -----------------------------------------------------------
@@ -199,37 +330,22 @@ draw_section(
 )
 
 if not df_volcat.empty:
-    latest_month = df_volcat["MONTH"].max()
-    peak_total = df_volcat.groupby("MONTH")["VOLUME_USD_BILLIONS"].sum().max()
-
-    c1, c2 = st.columns(2)
-    kpi_inline(c1, f"<strong>Peak Volume:</strong> <span class='v'>${peak_total:,.2f}B</span>", style=KPI_STYLE["teal"])
-    # quick dominance proxy: DEX share latest
-    dex_share = df_volcat.query("MONTH == @latest_month").pipe(
-        lambda d: 100 * d.loc[d["CATEGORY"]=="DEX Trading","VOLUME_USD_BILLIONS"].sum() / d["VOLUME_USD_BILLIONS"].sum()
-        if d["VOLUME_USD_BILLIONS"].sum() else np.nan
-    )
-    kpi_inline(c2, f"<strong>DEX Dominance (latest):</strong> <span class='v'>{dex_share:,.1f}%</span>", style=KPI_STYLE["blue"])
-
-    cats = df_volcat["CATEGORY"].unique().tolist()
-    colors = {
-        "Bridge Activity":"#14b8a6",
-        "DEX Trading":"#1d4ed8",
-        "Lending Deposits":"#10b981",
-        "Lending Borrows":"#7c3aed",
-        "Liquidations":"#f59e0b",
-        "NFT Sales":"#fb7185",
-        "Token Transfers":"#64748b"
-    }
-
-    fig = go.Figure()
-    for cat in cats:
-        d = df_volcat[df_volcat["CATEGORY"]==cat].sort_values("MONTH")
-        fig.add_trace(go.Scatter(
-            x=d["MONTH"], y=d["VOLUME_USD_BILLIONS"],
+    kpi_row([
+        (f"<strong>Peak Volume:</strong> <span class='v'>${kpis['volcat_peak']:,.2f}B</span>", KPI_STYLE["teal"]),
+        (f"<strong>DEX Dominance (latest):</strong> <span class='v'>{kpis['volcat_dex_share']:,.1f}%</span>", KPI_STYLE["blue"]),
+    ])
+
+    # one pass over the frame: groups come in CATEGORY order, rows keep the loader's MONTH order;
+    # traces are handed to the Figure in one batch (no per-trace add_trace validation round),
+    # with plain ndarrays so Plotly's encoder takes its array fast path instead of iterating Series
+    fig = go.Figure(data=[
+        go.Scatter(
+            x=d["MONTH"].to_numpy(), y=d["VOLUME_USD_BILLIONS"].to_numpy(),
             name=cat, mode="lines", stackgroup="one",
-            line=dict(width=0.7, color=colors.get(cat, "#94a3b8"))
-        ))
+            line=dict(width=0.7, color=CATEGORY_COLORS.get(cat, "#94a3b8"))
+        )
+        for cat, d in kpis["volcat_plot"].groupby("CATEGORY", observed=True)
+    ])
     fig.update_layout(
         height=420, margin=dict(l=10,r=10,t=20,b=10),
         legend=dict(orientation="h", yanchor="bottom", y=-0.2, x=0),
@@ -248,6 +364,58 @@ draw_section(
     "Choose one metric at a time to isolate user base (avg daily active addresses) vs network load (transactions)."
 )
 
+@st.cache_data(show_spinner=False, max_entries=4)
+def active_metric_fig(_data: pd.DataFrame, y_col: str, metric: str, mtime: float) -> go.Figure:
+    """
+    One figure per metric, built once per version of active_addresses.csv and reused when the
+    radio flips back. `_data` is not hashed: (y_col, mtime) is the key.
+    """
+    # Plot lines per sector
+    # Fixed order from the SECTOR categorical (SECTOR_ORDER, unexpected sectors last); observed=True
+    # skips NFT Transfers, left as an empty category after the merge. data is sorted by MONTH.
+    fig2 = go.Figure(data=[
+        go.Scatter(
+            x=d["MONTH"].to_numpy(), y=d[y_col].to_numpy(), name=sec,
+            mode="lines+markers",
+            line=dict(width=2, color=SECTOR_COLORS.get(sec))
+        )
+        for sec, d in _data.groupby("SECTOR", observed=True)
+    ])
+    fig2.update_layout(
+        height=420, margin=dict(l=10, r=10, t=10, b=10),
+        yaxis_title=metric,
+        legend=dict(orientation="h", yanchor="bottom", y=-0.2, x=0)
+    )
+    return fig2
+
+
+# Metric radio + KPIs + sector lines run as a fragment: toggling the metric reruns only this
+# block, not the whole script (the aggregates come precomputed from precompute_kpis)
+@st.fragment
+def active_metric_chart(data: pd.DataFrame, peaks: dict, dex_shares: dict, mtime: float):
+    # UI: metric toggle
+    metric = st.radio(
+        "Metric", options=["Avg Daily Active Addresses","Transactions"],
+        horizontal=True, index=0, key="active_metric"
+    )
+    if metric == "Avg Daily Active Addresses":
+        y_col = "AVG_DAILY_ACTIVE_ADDRESSES"
+        kpi_style = KPI_STYLE["teal"]   # users
+    else:
+        y_col = "TRANSACTIONS"
+        kpi_style = KPI_STYLE["blue"]   # tx
+
+    # KPIs (precomputed for both metrics)
+    peak_val = peaks[y_col]
+    dex_share = dex_shares[y_col]
+    kpi_row([
+        (f"<strong>Peak {metric}:</strong> <span class='v'>{peak_val:,.0f}</span>", kpi_style),
+        (f"<strong>DEX Trading Share (latest):</strong> <span class='v'>{(0 if pd.isna(dex_share) else dex_share):,.1f}%</span>", KPI_STYLE["blue"]),
+    ])
+
+    st.plotly_chart(active_metric_fig(data, y_col, metric, mtime), use_container_width=True)
+
+
 if not df_active.empty:
     # Expecting MONTH, SECTOR, AVG_DAILY_ACTIVE_ADDRESSES, TRANSACTIONS
     required = {"MONTH","SECTOR","AVG_DAILY_ACTIVE_ADDRESSES","TRANSACTIONS"}
@@ -255,91 +423,8 @@ if not df_active.empty:
     if missing:
         st.warning(f"Active activity CSV missing columns: {', '.join(sorted(missing))}")
     else:
-        # ❗ Merge NFT Transfers into Others (token transfers)
-        data = df_active.copy()
-        data["SECTOR"] = data["SECTOR"].replace({"NFT Transfers": "Others"})
-        # aggregate in case both 'Others' and 'NFT Transfers' existed for a month
-        data = (
-            data.groupby(["MONTH","SECTOR"], as_index=False)
-                .agg({
-                    "AVG_DAILY_ACTIVE_ADDRESSES": "sum",
-                    "TRANSACTIONS": "sum"
-                })
-                .sort_values(["MONTH","SECTOR"])
-        )
-
-        # UI: metric toggle
-        metric = st.radio(
-            "Metric", options=["Avg Daily Active Addresses","Transactions"],
-            horizontal=True, index=0, key="active_metric"
-        )
-        if metric == "Avg Daily Active Addresses":
-            y_col = "AVG_DAILY_ACTIVE_ADDRESSES"
-            kpi_style = KPI_STYLE["teal"]   # users
-        else:
-            y_col = "TRANSACTIONS"
-            kpi_style = KPI_STYLE["blue"]   # tx
-
-        latest = data["MONTH"].max()
-        d_last = data[data["MONTH"]==latest]
-
-        # KPIs
-        peak_val = data.groupby("MONTH")[y_col].sum().max()
-        c1, c2 = st.columns(2)
-        kpi_inline(
-            c1,
-            f"<strong>Peak {metric}:</strong> <span class='v'>{peak_val:,.0f}</span>",
-            style=kpi_style
-        )
-
-        dex_share = np.nan
-        if not d_last.empty and d_last[y_col].sum() > 0:
-            dex_share = 100 * d_last.loc[d_last["SECTOR"]=="DEX Trading", y_col].sum() / d_last[y_col].sum()
-        kpi_inline(
-            c2,
-            f"<strong>DEX Trading Share (latest):</strong> <span class='v'>{(0 if pd.isna(dex_share) else dex_share):,.1f}%</span>",
-            style=KPI_STYLE["blue"]
-        )
-
-        # Fixed order (without a separate NFT Transfers; it's merged into Others)
-        desired_order = [
-            "DEX Trading",
-            "Lending Deposits",
-            "Lending Borrows",
-            "NFT Sales",
-            "Others",  # includes NFT Transfers
-        ]
-        # Keep unexpected sectors (if any) at the end
-        seen = [s for s in desired_order if s in data["SECTOR"].unique()]
-        tail = [s for s in data["SECTOR"].unique() if s not in desired_order]
-        sectors_order = seen + tail
-
-        # Colors per sector
-        sector_colors = {
-            "DEX Trading": "#1d4ed8",       # blue
-            "Lending Deposits": "#10b981",  # green
-            "Lending Borrows": "#7c3aed",   # violet
-            "NFT Sales": "#f59e0b",         # amber
-            "Others": "#64748b",            # slate  (now includes NFT Transfers)
-        }
-
-        # Plot lines per sector
-        fig2 = go.Figure()
-        for sec in sectors_order:
-            d = data[data["SECTOR"]==sec].sort_values("MONTH")
-            if d.empty:
-                continue
-            fig2.add_trace(go.Scatter(
-                x=d["MONTH"], y=d[y_col], name=sec,
-                mode="lines+markers",
-                line=dict(width=2, color=sector_colors.get(sec, None))
-            ))
-        fig2.update_layout(
-            height=420, margin=dict(l=10, r=10, t=10, b=10),
-            yaxis_title=metric,
-            legend=dict(orientation="h", yanchor="bottom", y=-0.2, x=0)
-        )
-        st.plotly_chart(fig2, use_container_width=True)
+        # NFT Transfers merged into Others, summed per MONTH x SECTOR (see precompute_kpis)
+        active_metric_chart(kpis["active_data"], kpis["active_peak"], kpis["active_dex_share"], active_mtime)
 
         insight("Breadth and load trend higher. ‘Others’ (token transfers, incl. NFT transfers) is among the fastest-growing segments, while DEX trading and lending remain the cyclical anchors of network demand.")
 
@@ -360,25 +445,19 @@ draw_section(
 #st.markdown("**Chart B: User Adoption During Fee Evolution:** Overlay unique users (millions) with average fee (USD). Tests whether affordability expands the user base.")
 
 if not df_fees.empty:
-    # collapse to monthly totals (if multiple FEE_CATEGORY rows)
-    agg = df_fees.groupby("MONTH", as_index=False).agg({
-        "USERS_MILLIONS":"sum",
-        "AVG_FEE_USD":"mean"
-    }).sort_values("MONTH")
+    # monthly totals (if multiple FEE_CATEGORY rows), see precompute_kpis
+    agg = kpis["fees_agg"]
 
-    # KPIs
-    growth_users = 100 * (agg.iloc[-1]["USERS_MILLIONS"] - agg.iloc[0]["USERS_MILLIONS"]) / max(agg.iloc[0]["USERS_MILLIONS"], 1e-9)
-    fee_change   = 100 * (agg.iloc[-1]["AVG_FEE_USD"] - agg.iloc[0]["AVG_FEE_USD"]) / max(agg.iloc[0]["AVG_FEE_USD"], 1e-9)
-
-    c1, c2 = st.columns(2)
-    kpi_inline(c1, f"<strong>User Growth:</strong> <span class='v'>{growth_users:,.1f}%</span>", style=KPI_STYLE["teal"])
-    kpi_inline(c2, f"<strong>Fee Change:</strong> <span class='v'>{fee_change:,.1f}%</span>", style=KPI_STYLE["blue"])
+    kpi_row([
+        (f"<strong>User Growth:</strong> <span class='v'>{kpis['fees_user_growth']:,.1f}%</span>", KPI_STYLE["teal"]),
+        (f"<strong>Fee Change:</strong> <span class='v'>{kpis['fees_change']:,.1f}%</span>", KPI_STYLE["blue"]),
+    ])
 
     fig8 = make_subplots(specs=[[{"secondary_y": True}]])
-    fig8.add_trace(go.Scatter(x=agg["MONTH"], y=agg["USERS_MILLIONS"],
+    fig8.add_trace(go.Scatter(x=agg["MONTH"].to_numpy(), y=agg["USERS_MILLIONS"].to_numpy(),
                               name="Unique Users (M)", mode="lines+markers",
                               line=dict(color="#7c3aed", width=3)))
-    fig8.add_trace(go.Scatter(x=agg["MONTH"], y=agg["AVG_FEE_USD"],
+    fig8.add_trace(go.Scatter(x=agg["MONTH"].to_numpy(), y=agg["AVG_FEE_USD"].to_numpy(),
                               name="Average Fee (USD)", mode="lines+markers",
                               line=dict(color="#f59e0b", width=2, dash="dash")),
                    secondary_y=True)
@@ -412,10 +491,10 @@ import os, pandas as pd, numpy as np, altair as alt, streamlit as st
 # ---------- Metric card helpers (light-mode boxes) ----------
 from textwrap import dedent
 
-if "kpi_card" not in globals():
-    def kpi_card(label: str, value: str, pill: str | None = None, pill_color: str = "#10B981"):
+if "kpi_card_html" not in globals():
+    def kpi_card_html(label: str, value: str, pill: str | None = None, pill_color: str = "#10B981") -> str:
         """
-        Render a KPI in a rounded card with a thin border and optional pill badge.
+        HTML for a KPI in a rounded card with a thin border and optional pill badge.
         - label: small heading text
         - value: main number/text
         - pill: optional badge text (e.g., 'Tailwind', 'Headwind', 'Neutral')
@@ -429,8 +508,7 @@ if "kpi_card" not in globals():
             if pill else ""
         )
 
-        st.markdown(
-            dedent(f"""
+        return dedent(f"""
             <div style="
                 border:1px solid rgba(23,43,77,0.15);
                 border-left:6px solid rgba(59,130,246,0.85);
@@ -442,7 +520,14 @@ if "kpi_card" not in globals():
                     {value}{pill_html}
                 </div>
             </div>
-            """),
+            """).strip()
+
+
+if "kpi_cards_row" not in globals():
+    def kpi_cards_row(cards: list[str], cols: int = 4):
+        """Lay out prerendered kpi_card_html() cards in a single grid -> one st.markdown per row."""
+        st.markdown(
+            f'<div class="kpi-grid" style="--kpi-cols:{cols};">' + "".join(cards) + "</div>",
             unsafe_allow_html=True,
         )
 
@@ -455,24 +540,31 @@ if "draw_metrics_row" not in globals():
           ...
         ]
         """
-        cols = st.columns(cols)
-        for i, m in enumerate(metrics):
-            with cols[i % len(cols)]:
-                kpi_card(
+        kpi_cards_row(
+            [
+                kpi_card_html(
                     m.get("label", ""),
                     m.get("value", "—"),
                     m.get("pill"),
                     m.get("pill_color", "#10B981"),
                 )
+                for m in metrics
+            ],
+            cols=cols,
+        )
 
 
 def _to_month(s: pd.Series) -> pd.Series:
-    """Coerce to 'YYYY-MM' (tz-naive)."""
-    dt = pd.to_datetime(s, errors="coerce", utc=True).dt.tz_localize(None)
-    return dt.dt.to_period("M").astype(str)
+    """Coerce to month-start timestamps (tz-naive)."""
+    # every export uses ISO dates ('2024-07' or '2023-01-01T00:00:00.000Z'): pin the
+    # ISO8601 parser instead of letting pandas infer a format per column
+    dt = pd.to_datetime(s, errors="coerce", utc=True, format="ISO8601").dt.tz_localize(None)
+    # truncate with one NumPy unit cast (datetime64[M] floors to the month; NaT stays NaT)
+    return pd.Series(dt.to_numpy().astype("datetime64[M]").astype("datetime64[ns]"), index=dt.index, name=dt.name)
 
 def _coerce_num(s, div=None):
-    out = pd.to_numeric(s, errors="coerce")
+    # already-numeric columns (the usual case) pass through without a to_numeric copy
+    out = s if pd.api.types.is_numeric_dtype(s) else pd.to_numeric(s, errors="coerce")
     if div:
         out = out / div
     return out
@@ -483,67 +575,102 @@ def _fmt_money_m(x):
     return f"${x:,.0f}M"
 
 # ---- Load sources
-try:
-    fees_p = pd.read_csv("data/fees_price.csv")
-except Exception:
-    fees_p = pd.DataFrame()
-try:
-    eth_p = pd.read_csv("data/eth_price.csv")
-except Exception:
-    eth_p = pd.DataFrame()
-
-etf_m   = pd.read_csv("data/etf_flows_monthly.csv")
-rates_m = pd.read_csv("data/rates_expectations_monthly.csv")
-fed_m   = pd.read_csv("data/fedfunds_history_monthly.csv")
-
-# Normalize MONTH for all
-for df in [etf_m, rates_m, fed_m, fees_p, eth_p]:
-    if not df.empty:
-        if "MONTH" in df.columns:
-            df["MONTH"] = _to_month(df["MONTH"])
-        elif "DATE" in df.columns:
-            df["MONTH"] = _to_month(df["DATE"])
-
-# Fees: ensure AVG_TX_FEE_USD exists (fallback = ETH fee * price)
-if not fees_p.empty:
-    if "AVG_TX_FEE_USD" not in fees_p.columns:
-        if set(["AVG_TX_FEE_ETH","AVG_ETH_PRICE_USD"]).issubset(fees_p.columns):
-            fees_p["AVG_TX_FEE_USD"] = _coerce_num(fees_p["AVG_TX_FEE_ETH"]) * _coerce_num(fees_p["AVG_ETH_PRICE_USD"])
-        else:
-            fees_p["AVG_TX_FEE_USD"] = np.nan
-    fees_p = fees_p[["MONTH","AVG_TX_FEE_USD"]].drop_duplicates("MONTH")
+DRIVER_FILES = {
+    "fees":  "data/fees_price.csv",
+    "eth":   "data/eth_price.csv",
+    "etf":   "data/etf_flows_monthly.csv",
+    "rates": "data/rates_expectations_monthly.csv",
+}
 
-# ETH price & activity
-if not eth_p.empty:
-    keep_cols = [c for c in ["MONTH","ACTIVITY_INDEX_ZSCORE","AVG_ETH_PRICE_USD"] if c in eth_p.columns]
-    eth_p = eth_p[keep_cols].drop_duplicates("MONTH")
+# Columns the panel uses from each export (plus the MONTH/DATE key); the rest is never parsed
+DRIVER_COLS = {
+    "fees":  ["AVG_TX_FEE_USD", "AVG_TX_FEE_ETH", "AVG_ETH_PRICE_USD"],
+    "eth":   ["ACTIVITY_INDEX_ZSCORE", "AVG_ETH_PRICE_USD"],
+    "etf":   ["ETF_NET_FLOW_USD_MILLIONS"],
+    "rates": ["RATES_DIR", "RATES_PROB"],
+}
 
-# ETF flows (monthly sums)
-if "ETF_NET_FLOW_USD_MILLIONS" in etf_m.columns:
-    etf_m = etf_m[["MONTH","ETF_NET_FLOW_USD_MILLIONS"]].groupby("MONTH", as_index=False).sum()
-else:
-    etf_m["ETF_NET_FLOW_USD_MILLIONS"] = np.nan
-    etf_m = etf_m[["MONTH","ETF_NET_FLOW_USD_MILLIONS"]]
-
-# Rates: clean prob to [0,1]
-if "RATES_PROB" in rates_m.columns:
-    p95 = pd.to_numeric(rates_m["RATES_PROB"], errors="coerce").quantile(0.95)
-    if pd.notna(p95) and p95 > 1.5:  # looks like 0–100
-        rates_m["RATES_PROB"] = pd.to_numeric(rates_m["RATES_PROB"], errors="coerce")/100.0
-    else:
-        rates_m["RATES_PROB"] = pd.to_numeric(rates_m["RATES_PROB"], errors="coerce")
-else:
-    rates_m["RATES_PROB"] = np.nan
-if "RATES_DIR" not in rates_m.columns:
-    rates_m["RATES_DIR"] = np.nan
-rates_m = rates_m[["MONTH","RATES_DIR","RATES_PROB"]].drop_duplicates("MONTH")
-
-# Merge panel on MONTH
-panel = None
-for d in [eth_p, fees_p, etf_m, rates_m]:
-    if d is None or d.empty:
-        continue
-    panel = d if panel is None else panel.merge(d, on="MONTH", how="outer")
+def _read_monthly(path: str, cols: list[str]) -> pd.DataFrame:
+    """Read `cols` (+ MONTH/DATE) from a monthly export, MONTH normalized to month start; empty frame if unreadable."""
+    wanted = {"MONTH", "DATE", *cols}
+    try:
+        # callable usecols: absent columns are simply skipped (no header peek needed)
+        df = pd.read_csv(path, usecols=lambda c: c in wanted, engine="c")
+    except Exception:
+        return pd.DataFrame()
+    if "MONTH" in df.columns:
+        df["MONTH"] = _to_month(df["MONTH"])
+    elif "DATE" in df.columns:
+        df["MONTH"] = _to_month(df["DATE"])
+    return df
+
+@st.cache_data(show_spinner=False, persist="disk", max_entries=1)
+def build_drivers_panel(mtimes: tuple[float, ...]) -> pd.DataFrame | None:
+    """
+    Merge ETH activity/price, fees, ETF flows and rate expectations into one monthly panel.
+    Runs once per version of the source files: `mtimes` only serves as the cache key.
+    persist="disk" keeps the result across process restarts, so a cold start with unchanged
+    exports loads the pickled panel instead of re-reading and re-merging the CSVs.
+    max_entries=1: only the current version of the exports is worth keeping.
+    """
+    fees_p, eth_p, etf_m, rates_m = (_read_monthly(p, DRIVER_COLS[k]) for k, p in DRIVER_FILES.items())
+
+    # Fees: ensure AVG_TX_FEE_USD exists (fallback = ETH fee * price)
+    if not fees_p.empty:
+        if "AVG_TX_FEE_USD" not in fees_p.columns:
+            if set(["AVG_TX_FEE_ETH","AVG_ETH_PRICE_USD"]).issubset(fees_p.columns):
+                fees_p["AVG_TX_FEE_USD"] = _coerce_num(fees_p["AVG_TX_FEE_ETH"]) * _coerce_num(fees_p["AVG_ETH_PRICE_USD"])
+            else:
+                fees_p["AVG_TX_FEE_USD"] = np.nan
+        fees_p = fees_p[["MONTH","AVG_TX_FEE_USD"]].drop_duplicates("MONTH")
+
+    # ETH price & activity
+    if not eth_p.empty:
+        keep_cols = [c for c in ["MONTH","ACTIVITY_INDEX_ZSCORE","AVG_ETH_PRICE_USD"] if c in eth_p.columns]
+        eth_p = eth_p[keep_cols].drop_duplicates("MONTH")
+
+    # ETF flows (monthly sums)
+    if not etf_m.empty:
+        if "ETF_NET_FLOW_USD_MILLIONS" in etf_m.columns:
+            # MONTH is already month-start: resample's ordered bucketing instead of a hash groupby;
+            # bins for months without rows (gaps) are dropped again, as groupby never creates them
+            flows = etf_m.dropna(subset=["MONTH"]).set_index("MONTH")["ETF_NET_FLOW_USD_MILLIONS"].resample("MS")
+            etf_m = flows.sum()[flows.size() > 0].reset_index()
+        else:
+            etf_m["ETF_NET_FLOW_USD_MILLIONS"] = np.nan
+            etf_m = etf_m[["MONTH","ETF_NET_FLOW_USD_MILLIONS"]]
+
+    # Rates: clean prob to [0,1]
+    if not rates_m.empty:
+        if "RATES_PROB" in rates_m.columns:
+            prob = pd.to_numeric(rates_m["RATES_PROB"], errors="coerce")  # parse once, then rescale
+            p95 = prob.quantile(0.95)
+            rates_m["RATES_PROB"] = prob / 100.0 if pd.notna(p95) and p95 > 1.5 else prob  # 0–100 -> [0,1]
+        else:
+            rates_m["RATES_PROB"] = np.nan
+        if "RATES_DIR" not in rates_m.columns:
+            rates_m["RATES_DIR"] = np.nan
+        # few distinct labels: ordered categorical codes (RATES_DIR_ORDER) instead of one Python str per month
+        rates_m["RATES_DIR"] = ordered_category(rates_m["RATES_DIR"], RATES_DIR_ORDER)
+        rates_m = rates_m[["MONTH","RATES_DIR","RATES_PROB"]].drop_duplicates("MONTH")
+
+    # Merge panel on MONTH: one index-aligned outer concat instead of chained hash merges
+    # (MONTH is unique in every piece after drop_duplicates/groupby; concat raises otherwise)
+    pieces = [d.set_index("MONTH") for d in (eth_p, fees_p, etf_m, rates_m) if not d.empty]
+    if not pieces:
+        return None
+    panel = pd.concat(pieces, axis=1, join="outer").sort_index().rename_axis("MONTH_DT").reset_index()
+    # MONTH_DT is the datetime key; MONTH is the 'YYYY-MM' label used in tooltips and tables
+    panel.insert(0, "MONTH", panel["MONTH_DT"].dt.strftime("%Y-%m"))
+    # coerce the numeric drivers once, here, so the sections below use them as-is
+    # (only columns the parser left as text need it: numeric ones are not touched/copied)
+    num_cols = [c for c in panel.columns.difference(["MONTH", "MONTH_DT", "RATES_DIR"])
+                if not pd.api.types.is_numeric_dtype(panel[c])]
+    if num_cols:
+        panel[num_cols] = panel[num_cols].apply(pd.to_numeric, errors="coerce")
+    return downcast_numeric(panel)
+
+panel = build_drivers_panel(tuple(_mtime(p) for p in DRIVER_FILES.values()))
 
 # STOP if empty
 if panel is None or panel.empty:
@@ -560,29 +687,24 @@ if panel is None or panel.empty:
         "and shifting interest-rate expectations can explain the rise, and how these factors may spill over to ETH price."
     ),
     )
-    st.info("Data not found. Ensure these exist under /data: eth_price.csv, fees_price.csv, etf_flows_monthly.csv, rates_expectations_monthly.csv, fedfunds_history_monthly.csv.")
+    st.info("Data not found. Ensure these exist under /data: eth_price.csv, fees_price.csv, etf_flows_monthly.csv, rates_expectations_monthly.csv.")
     st.stop()
 
 
-# Sort, coerce, and drop September 2025+
-panel["MONTH_DT"] = pd.to_datetime(panel["MONTH"], format="%Y-%m", errors="coerce")
-panel = panel.sort_values("MONTH_DT")
+# Panel comes sorted by MONTH_DT with numeric columns already coerced; drop September 2025+
 
 # EXCLUDE any data beyond 2025-08
 cutoff = pd.to_datetime("2025-08")
 panel = panel[panel["MONTH_DT"] <= cutoff]
 
-for c in ["ACTIVITY_INDEX_ZSCORE","AVG_TX_FEE_USD","ETF_NET_FLOW_USD_MILLIONS","AVG_ETH_PRICE_USD"]:
-    if c in panel.columns:
-        panel[c] = pd.to_numeric(panel[c], errors="coerce")
-
-# Latest row for KPIs
-latest = panel.dropna(subset=["MONTH_DT"]).tail(1).squeeze()
-k1 = latest["ACTIVITY_INDEX_ZSCORE"] if "ACTIVITY_INDEX_ZSCORE" in panel.columns else np.nan
-k2 = latest["AVG_TX_FEE_USD"] if "AVG_TX_FEE_USD" in panel.columns else np.nan
-k3 = latest["ETF_NET_FLOW_USD_MILLIONS"] if "ETF_NET_FLOW_USD_MILLIONS" in panel.columns else np.nan
-k4_dir = latest["RATES_DIR"] if "RATES_DIR" in panel.columns else np.nan
-k4_p   = latest["RATES_PROB"] if "RATES_PROB" in panel.columns else np.nan
+# Latest row for KPIs: panel is sorted by MONTH_DT and the cutoff filter already dropped NaT
+# months, so the last row is the latest one (no dropna copy needed)
+latest = panel.iloc[-1]
+k1 = latest.get("ACTIVITY_INDEX_ZSCORE", np.nan)
+k2 = latest.get("AVG_TX_FEE_USD", np.nan)
+k3 = latest.get("ETF_NET_FLOW_USD_MILLIONS", np.nan)
+k4_dir = latest.get("RATES_DIR", np.nan)
+k4_p   = latest.get("RATES_PROB", np.nan)
 
 # --- Render section
 draw_section(
@@ -796,9 +918,8 @@ def compute_activity_index(df, tx_col="total_transactions",
         set(panel.columns)
     )
     if has_cols:
-        _tmp = panel[["MONTH","total_transactions","unique_users","total_defi_volume_usd"]].dropna().copy()
-        _tmp["MONTH_DT"] = pd.to_datetime(_tmp["MONTH"], errors="coerce")
-        _tmp = _tmp.sort_values("MONTH_DT")
+        # panel is already sorted by MONTH_DT (and MONTH is derived from it): no re-parse/re-sort
+        _tmp = panel[["MONTH","total_transactions","unique_users","total_defi_volume_usd"]].dropna()
         if not _tmp.empty:
             last = _tmp.tail(1).squeeze()
             st.markdown("**Latest input snapshot:**")
@@ -812,16 +933,17 @@ def compute_activity_index(df, tx_col="total_transactions",
 
 
 # KPIs
-c1, c2, c3, c4 = st.columns(4)
-with c1: kpi_card("Activity Index (latest)", f"{k1:,.2f}" if pd.notna(k1) else "—")
-with c2: kpi_card("Avg Tx Fee (USD)", f"${k2:,.2f}" if pd.notna(k2) else "—")
-with c3: kpi_card("ETF Net Flow (M)", _fmt_money_m(k3))
-with c4:
-    if pd.notna(k4_dir):
-        prob_txt = f"{k4_p*100:,.0f}%" if pd.notna(k4_p) else "—"
-        kpi_card("Rates Direction", f"{k4_dir} ({prob_txt})")
-    else:
-        kpi_card("Rates Direction", "—")
+if pd.notna(k4_dir):
+    prob_txt = f"{k4_p*100:,.0f}%" if pd.notna(k4_p) else "—"
+    rates_txt = f"{k4_dir} ({prob_txt})"
+else:
+    rates_txt = "—"
+kpi_cards_row([
+    kpi_card_html("Activity Index (latest)", f"{k1:,.2f}" if pd.notna(k1) else "—"),
+    kpi_card_html("Avg Tx Fee (USD)", f"${k2:,.2f}" if pd.notna(k2) else "—"),
+    kpi_card_html("ETF Net Flow (M)", _fmt_money_m(k3)),
+    kpi_card_html("Rates Direction", rates_txt),
+])
 
 # --- Charts
 alt.data_transformers.disable_max_rows()
@@ -833,7 +955,13 @@ st.markdown("")
 st.markdown("**Chart A: Activity vs Fees & ETF flows**")
 
 ts_cols = [c for c in ["MONTH","MONTH_DT","ACTIVITY_INDEX_ZSCORE","AVG_TX_FEE_USD","ETF_NET_FLOW_USD_MILLIONS"] if c in panel.columns]
-ts = panel[ts_cols].dropna(subset=["MONTH_DT"]).copy()
+ts = panel[ts_cols].dropna(subset=["MONTH_DT"])  # column selection + dropna already return a new frame
+# months that only exist in the rates export (outer join) have nothing to draw here: don't ship them
+ts_vals = [c for c in ("ACTIVITY_INDEX_ZSCORE","AVG_TX_FEE_USD","ETF_NET_FLOW_USD_MILLIONS") if c in ts.columns]
+ts = ts.loc[ts[ts_vals].notna().any(axis=1)]
+# display-only precision: float32 values and second-resolution dates halve the payload sent to Vega
+ts = ts.astype({c: "float32" for c in ts_vals})
+ts["MONTH_DT"] = ts["MONTH_DT"].astype("datetime64[s]")
 
 left = alt.Chart(ts).mark_line(point=False, color="#0ea5e9").encode(
     x=alt.X("MONTH_DT:T", title="Month"),
@@ -860,17 +988,6 @@ chart_ts = alt.layer(left, fee_line, etf_bar).resolve_scale(y="independent").pro
 st.altair_chart(chart_ts, use_container_width=True)
 
 # --- Insight line
-insights = []
-if set(["ACTIVITY_INDEX_ZSCORE","AVG_TX_FEE_USD"]).issubset(panel.columns):
-    r = panel[["ACTIVITY_INDEX_ZSCORE","AVG_TX_FEE_USD"]].corr().iloc[0,1]
-    if pd.notna(r): insights.append(f"Activity vs Fees corr: {r:+.2f} (usually negative).")
-if set(["ACTIVITY_INDEX_ZSCORE","ETF_NET_FLOW_USD_MILLIONS"]).issubset(panel.columns):
-    r = panel[["ACTIVITY_INDEX_ZSCORE","ETF_NET_FLOW_USD_MILLIONS"]].corr().iloc[0,1]
-    if pd.notna(r): insights.append(f"Activity vs ETF Flows corr: {r:+.2f}.")
-if set(["ACTIVITY_INDEX_ZSCORE","AVG_ETH_PRICE_USD"]).issubset(panel.columns):
-    r = panel[["ACTIVITY_INDEX_ZSCORE","AVG_ETH_PRICE_USD"]].corr().iloc[0,1]
-    if pd.notna(r): insights.append(f"Price vs Activity corr: {r:+.2f}.")
-
 insight("Lower fees and positive ETF net flows tend to coincide with stronger activity. Policy leaning (cut vs. hold) is a secondary tailwind when aligned with cheap execution.")
 
 
@@ -895,48 +1012,48 @@ driver_options = {
     "ETH Price (USD)": ("AVG_ETH_PRICE_USD", "ETH Price (USD)", "ETH Price (USD)"),
 }
 
-choice = st.selectbox("Driver", list(driver_options.keys()), index=0)
-col_x, x_title, tip_title = driver_options[choice]
-
-# Prepare data safely
-need_cols = ["MONTH", "MONTH_DT", "ACTIVITY_INDEX_ZSCORE", col_x]
-if not set(need_cols).issubset(panel.columns):
-    missing = [c for c in need_cols if c not in panel.columns]
-    st.warning(f"Missing columns for this view: {', '.join(missing)}")
-else:
-    df_drv = panel[need_cols].copy()
+# Driver pick + scatter run as a fragment: changing the driver reruns only this block
+@st.fragment
+def driver_scatter(panel: pd.DataFrame):
+    choice = st.selectbox("Driver", list(driver_options.keys()), index=0)
+    col_x, x_title, tip_title = driver_options[choice]
+
+    # Prepare data safely
+    need_cols = ["MONTH", "MONTH_DT", "ACTIVITY_INDEX_ZSCORE", col_x]
+    if not set(need_cols).issubset(panel.columns):
+        missing = [c for c in need_cols if c not in panel.columns]
+        st.warning(f"Missing columns for this view: {', '.join(missing)}")
+    else:
+        df_drv = panel[need_cols].dropna(subset=[col_x, "ACTIVITY_INDEX_ZSCORE", "MONTH_DT"])
 
-    # Coerce numeric just in case
-    df_drv[col_x] = pd.to_numeric(df_drv[col_x], errors="coerce")
-    df_drv["ACTIVITY_INDEX_ZSCORE"] = pd.to_numeric(df_drv["ACTIVITY_INDEX_ZSCORE"], errors="coerce")
-    df_drv = df_drv.dropna(subset=[col_x, "ACTIVITY_INDEX_ZSCORE", "MONTH_DT"])
+        if df_drv.empty:
+            st.info("No overlapping data points to plot.")
+        else:
+            scatter = alt.Chart(df_drv).mark_circle(size=70, opacity=0.7, color="#0ea5e9").encode(
+                x=alt.X(f"{col_x}:Q", title=x_title),
+                y=alt.Y("ACTIVITY_INDEX_ZSCORE:Q", title="Activity Index"),
+                tooltip=[
+                    alt.Tooltip("MONTH:N", title="Month"),
+                    alt.Tooltip(f"{col_x}:Q", title=tip_title, format=",.2f"),
+                    alt.Tooltip("ACTIVITY_INDEX_ZSCORE:Q", title="Activity", format=",.2f"),
+                ],
+            )
 
-    if df_drv.empty:
-        st.info("No overlapping data points to plot.")
-    else:
-        scatter = alt.Chart(df_drv).mark_circle(size=70, opacity=0.7, color="#0ea5e9").encode(
-            x=alt.X(f"{col_x}:Q", title=x_title),
-            y=alt.Y("ACTIVITY_INDEX_ZSCORE:Q", title="Activity Index"),
-            tooltip=[
-                alt.Tooltip("MONTH:N", title="Month"),
-                alt.Tooltip(f"{col_x}:Q", title=tip_title, format=",.2f"),
-                alt.Tooltip("ACTIVITY_INDEX_ZSCORE:Q", title="Activity", format=",.2f"),
-            ],
-        )
+            reg = scatter.transform_regression(col_x, "ACTIVITY_INDEX_ZSCORE").mark_line(color="#111827")
 
-        reg = scatter.transform_regression(col_x, "ACTIVITY_INDEX_ZSCORE").mark_line(color="#111827")
+            st.altair_chart((scatter + reg).properties(height=340), use_container_width=True)
 
-        st.altair_chart((scatter + reg).properties(height=340), use_container_width=True)
+            # Recent 3-observation direction cue
+            # (df_drv keeps the panel's MONTH_DT order, so the last rows are the latest months)
+            tail = df_drv[[col_x, "ACTIVITY_INDEX_ZSCORE"]].to_numpy()[-3:]
+            if len(tail) >= 2:
+                dx, dy = tail[-1] - tail[0]
+                trend_x = "↑" if dx > 0 else ("↓" if dx < 0 else "→")
+                trend_y = "↑" if dy > 0 else ("↓" if dy < 0 else "→")
+                st.caption(f"Recent trend (last 3 obs): {x_title} {trend_x}, Activity {trend_y}.")
 
-        # Recent 3-observation direction cue
-        tail = df_drv.sort_values("MONTH_DT").tail(3)
-        if len(tail) >= 2:
-            dx = tail[col_x].iloc[-1] - tail[col_x].iloc[0]
-            dy = tail["ACTIVITY_INDEX_ZSCORE"].iloc[-1] - tail["ACTIVITY_INDEX_ZSCORE"].iloc[0]
-            trend_x = "↑" if dx > 0 else ("↓" if dx < 0 else "→")
-            trend_y = "↑" if dy > 0 else ("↓" if dy < 0 else "→")
-            st.caption(f"Recent trend (last 3 obs): {x_title} {trend_x}, Activity {trend_y}.")
 
+driver_scatter(panel)
 
 insight("The slope quantifies sensitivity. Negative slope for fees (cheaper → more activity) and positive slope for ETF net flows are consistent with Section 3.")
 
@@ -952,21 +1069,17 @@ draw_section(
 
 
 if not df_eth.empty:
-    price_min, price_max = df_eth["AVG_ETH_PRICE_USD"].min(), df_eth["AVG_ETH_PRICE_USD"].max()
-    corr = np.corrcoef(
-        df_eth["AVG_ETH_PRICE_USD"].astype(float),
-        df_eth["ACTIVITY_INDEX_ZSCORE"].astype(float)
-    )[0,1] if len(df_eth)>1 else np.nan
-
-    c1, c2 = st.columns(2)
-    kpi_inline(c1, f"<strong>Price Range:</strong> <span class='v'>${price_min:,.0f} – ${price_max:,.0f}</span>", style=KPI_STYLE["blue"])
-    kpi_inline(c2, f"<strong>Correlation (Price vs. Activity):</strong> <span class='v'>{corr:,.2f}</span>", style=KPI_STYLE["teal"])
+    kpi_row([
+        (f"<strong>Price Range:</strong> <span class='v'>${kpis['eth_price_min']:,.0f} – ${kpis['eth_price_max']:,.0f}</span>", KPI_STYLE["blue"]),
+        (f"<strong>Correlation (Price vs. Activity):</strong> <span class='v'>{kpis['eth_corr']:,.2f}</span>", KPI_STYLE["teal"]),
+    ])
 
     fig7 = make_subplots(specs=[[{"secondary_y": True}]])
-    fig7.add_trace(go.Scatter(x=df_eth["MONTH"], y=df_eth["AVG_ETH_PRICE_USD"],
+    eth_plot = kpis["eth_plot"]  # MONTH as 'YYYY-MM' labels
+    fig7.add_trace(go.Scatter(x=eth_plot["MONTH"].to_numpy(), y=eth_plot["AVG_ETH_PRICE_USD"].to_numpy(),
                               name="ETH Price (USD)", mode="lines+markers",
                               line=dict(color="#1d4ed8", width=2)))
-    fig7.add_trace(go.Scatter(x=df_eth["MONTH"], y=df_eth["ACTIVITY_INDEX_ZSCORE"],
+    fig7.add_trace(go.Scatter(x=eth_plot["MONTH"].to_numpy(), y=eth_plot["ACTIVITY_INDEX_ZSCORE"].to_numpy(),
                               name="Activity Index", mode="lines+markers",
                               line=dict(color="#14b8a6", width=3, dash="dot")),
                    secondary_y=True)
@@ -995,9 +1108,10 @@ if not need.issubset(panel.columns):
     st.warning("MCIS: missing columns: " + ", ".join(sorted(need - set(panel.columns))))
 else:
     # --- base frame, make a proper monthly index and trim any partial last month
-    df = panel.copy()
+    # set_index/assign below already return new frames, no defensive copy needed
+    df = panel
     if "MONTH_DT" in df.columns and pd.api.types.is_datetime64_any_dtype(df["MONTH_DT"]):
-        df = df.sort_values("MONTH_DT").set_index("MONTH_DT")
+        df = df.set_index("MONTH_DT")  # build_drivers_panel already sorted by MONTH_DT
     else:
         mdt = pd.to_datetime(df["MONTH"], errors="coerce", utc=False)
         df = df.assign(MONTH_DT=mdt).sort_values("MONTH_DT").set_index("MONTH_DT")
@@ -1008,14 +1122,14 @@ else:
     #    if last.to_period("M") == prev.to_period("M") + 1 and last.day <= 15:
     #        df = df.iloc[:-1]
 
-    # --- numeric coercion
-    y = pd.to_numeric(df["ACTIVITY_INDEX_ZSCORE"], errors="coerce")
-    price = pd.to_numeric(df["AVG_ETH_PRICE_USD"], errors="coerce")
+    # --- series (already numeric: coerced once when the panel was built)
+    y = df["ACTIVITY_INDEX_ZSCORE"]
+    price = df["AVG_ETH_PRICE_USD"]
 
     # raw drivers
-    etf_raw  = pd.to_numeric(df["ETF_NET_FLOW_USD_MILLIONS"], errors="coerce")
-    rate_raw = pd.to_numeric(df["RATES_PROB"], errors="coerce")  # may be 0–1 or 0–100
-    fee_raw  = pd.to_numeric(df["AVG_TX_FEE_USD"], errors="coerce")
+    etf_raw  = df["ETF_NET_FLOW_USD_MILLIONS"]
+    rate_raw = df["RATES_PROB"]  # may be 0–1 or 0–100
+    fee_raw  = df["AVG_TX_FEE_USD"]
 
     # normalize rate probability to 0..1 if it comes as percent
     if rate_raw.dropna().max() > 1.00001:
@@ -1045,11 +1159,23 @@ else:
 
     # --- choose lags (0..2) that maximize |corr| with activity
     #     fee is expected inverse (sign = -1), etf & rate expected positive
+    def _lag_corr(yv: np.ndarray, xv: np.ndarray, L: int) -> float:
+        """corr(y_t, x_{t-L}) over pairwise-complete months, on raw arrays (no shifted Series / 2x2 frame)."""
+        a, b = (yv[L:], xv[:len(xv) - L]) if L else (yv, xv)
+        ok = ~(np.isnan(a) | np.isnan(b))
+        if ok.sum() < 2:
+            return np.nan
+        a, b = a[ok] - a[ok].mean(), b[ok] - b[ok].mean()
+        den = np.sqrt((a * a).sum() * (b * b).sum())
+        return float((a * b).sum() / den) if den > 0 else np.nan
+
+    y_arr = y.to_numpy(dtype="float64")
     lags = {}
     for col, sign in [("etf", +1), ("rate", +1), ("fee", -1)]:
+        x_arr = Xraw[col].to_numpy(dtype="float64")
         best_lag, best_score = 0, -np.inf
         for L in (0, 1, 2):
-            c = pd.concat([y, Xraw[col].shift(L)], axis=1).corr().iloc[0, 1]
+            c = _lag_corr(y_arr, x_arr, L)
             if pd.notna(c):
                 score = abs(c * sign)
                 if score > best_score:
@@ -1309,14 +1435,6 @@ else:
             .properties(height=320)
         )
         st.altair_chart(ch_line, use_container_width=True)
-        
-        
-        # --- Prepare scatter data (MCIS vs ΔActivity)
-        sc_df = pd.DataFrame({
-            "MONTH": MCISz.index,
-            "MCIS": MCISz.values,
-            "DeltaActivityNext": dy_next.reindex(MCISz.index).values
-        }).dropna()
 
         st.markdown(
             "- **Interpretation.** MCIS > 0 signals a supportive backdrop (ETF demand + policy ease − fees). "
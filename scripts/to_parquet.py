@@ -0,0 +1,29 @@
+# scripts/to_parquet.py
+"""
+One-off conversion of the CSV exports in data/ to zstd Parquet.
+
+app.py's read_csv() prefers data/<name>.parquet over data/<name>.csv when the
+Parquet copy exists and is at least as new as the CSV, so re-run this after
+refreshing an export:
+
+    python scripts/to_parquet.py
+"""
+from pathlib import Path
+
+import pandas as pd
+
+DATA_DIR = Path(__file__).resolve().parent.parent / "data"
+
+
+def main():
+    for fp in sorted(DATA_DIR.glob("*.csv")):
+        df = pd.read_csv(fp, sep=None, engine="python")  # a few exports use ';'
+        if "MONTH" in df.columns:
+            df["MONTH"] = pd.to_datetime(df["MONTH"], format="ISO8601")
+        out = fp.with_suffix(".parquet")
+        df.to_parquet(out, engine="pyarrow", compression="zstd", index=False)
+        print(f"{fp.name} -> {out.name} ({fp.stat().st_size:,} -> {out.stat().st_size:,} bytes)")
+
+
+if __name__ == "__main__":
+    main()